@@ -1,4 +1,6 @@
+import numpy as np
 import pandas as pd
+from backtester._engine import rolling_mean
 from Strategies.base_strategy import Strategy
 
 class SMACrossover(Strategy):
@@ -9,14 +11,14 @@ class SMACrossover(Strategy):
 
     def generate_signals(self, panel, breadth):
         close = panel["close"].unstack(level=1)
-        short_sma = close.rolling(self.short).mean()
-        long_sma = close.rolling(self.long).mean()
-        sigs = (short_sma > long_sma).astype(int).diff().fillna(0)
-        signals = []
-        for dt in sigs.index:
-            for t in sigs.columns:
-                if sigs.loc[dt, t] == 1:
-                    signals.append((dt, t, 1))
-                elif sigs.loc[dt, t] == -1:
-                    signals.append((dt, t, -1))
-        return pd.DataFrame(signals, columns=["date","ticker","signal"]).set_index(["date","ticker"])
+        c = close.to_numpy(dtype=np.float64)
+        short_sma = rolling_mean(c, self.short, self.short)
+        long_sma = rolling_mean(c, self.long, self.long)
+        cross = (short_sma > long_sma).astype(np.int8)
+        # Keep only the crossover days: +1 on a bullish cross, -1 on a bearish one
+        diff = np.diff(cross, axis=0)
+        rows, cols = np.nonzero(diff)
+        index = pd.MultiIndex.from_arrays(
+            [close.index[rows + 1], close.columns[cols]], names=["date", "ticker"]
+        )
+        return pd.DataFrame({"signal": diff[rows, cols].astype(int)}, index=index)
@@ -0,0 +1,102 @@
+import os
+import hashlib
+import tempfile
+import functools
+from typing import Callable, Optional
+import pandas as pd
+from backtester.data_handler import DataHandler, _scan_csv
+from backtester.breadth import BreadthCalculator
+
+# -------------------------------
+# Shared helpers for the driver scripts
+# -------------------------------
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache")
+
+
+def set_display_options() -> None:
+    """Cap pandas' display formatter for the frames the strategy scripts print."""
+    pd.set_option("display.max_columns", 10)
+    pd.set_option("display.width", 120)
+
+
+def _cache_path(prefix: str, folder: str, *extra) -> str:
+    """
+    Cache file for folder plus any extra arguments, named
+    <prefix>_<hash of folder and arguments>_<hash of CSV names and mtimes>.parquet
+    """
+    # DirEntry.stat() reuses the directory read on Windows, so no per-file stat call
+    stamp = [(e.name, e.stat().st_mtime) for e in _scan_csv(folder)]
+    args_key = hashlib.sha1(repr((os.path.abspath(folder), extra)).encode()).hexdigest()[:16]
+    data_key = hashlib.sha1(repr(stamp).encode()).hexdigest()[:16]
+    return os.path.join(CACHE_DIR, f"{prefix}_{args_key}_{data_key}.parquet")
+
+
+def _cached_frame(path: str, build) -> pd.DataFrame:
+    """
+    Read the DataFrame cached at path, or build() it and cache it there.
+    The file is written under a temporary name and renamed into place, so an
+    interrupted run never leaves a truncated cache behind; entries for the same
+    folder and arguments but older CSV contents are then removed.
+    """
+    if os.path.exists(path):
+        return pd.read_parquet(path)
+
+    df = build()
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+    os.close(fd)
+    try:
+        df.to_parquet(tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        os.remove(tmp)
+        raise
+
+    stem = os.path.basename(path).rsplit("_", 1)[0] + "_"
+    with os.scandir(CACHE_DIR) as it:
+        stale = [e.path for e in it if e.name.startswith(stem) and e.path != path]
+    for stale_path in stale:
+        os.remove(stale_path)
+    return df
+
+
+def cached_panel(folder: str, use_union_dates: bool = False,
+                 handler: Optional[Callable[[], DataHandler]] = None) -> pd.DataFrame:
+    """
+    Return DataHandler(folder).get_panel(use_union_dates), memoized on disk as Parquet.
+    The cache is invalidated whenever a CSV in folder is added, removed or modified.
+    handler optionally supplies the DataHandler to build from on a cache miss.
+    """
+    handler = handler or functools.partial(DataHandler, folder)
+    return _cached_frame(
+        _cache_path("panel", folder, use_union_dates),
+        lambda: handler().get_panel(use_union_dates=use_union_dates),
+    )
+
+
+def cached_breadth(folder: str, handler: Optional[Callable[[], DataHandler]] = None,
+                   **kwargs) -> pd.DataFrame:
+    """
+    Return BreadthCalculator(DataHandler(folder)).compute(**kwargs), memoized on
+    disk as Parquet. Keyed like cached_panel, on folder plus the compute arguments;
+    the CSVs are only loaded on a cache miss, through handler if given.
+    """
+    handler = handler or functools.partial(DataHandler, folder)
+    return _cached_frame(
+        _cache_path("breadth", folder, sorted(kwargs.items())),
+        lambda: BreadthCalculator(handler()).compute(**kwargs),
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def load_context(folder: str):
+    """
+    Build (panel, breadth) for folder once per process, so scripts run
+    back-to-back in one session (e.g. under pytest) share the same objects.
+    Callers must treat the returned objects as read-only.
+    """
+    # At most one DataHandler, built only if one of the caches misses
+    handler = functools.lru_cache(maxsize=None)(functools.partial(DataHandler, folder))
+    panel = cached_panel(folder, handler=handler)
+    breadth = cached_breadth(folder, handler=handler)
+    return panel, breadth
@@ -0,0 +1,10 @@
+import os
+
+# -------------------------------
+# Pin BLAS/OpenMP/Numba thread pools for the driver scripts. Import this module
+# before numpy so nested pools (numba prange, BLAS, joblib workers) share the
+# cores instead of oversubscribing them; values already set in the environment win.
+# -------------------------------
+_threads = str(max(1, (os.cpu_count() or 2) // 2))
+for _var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "NUMBA_NUM_THREADS"):
+    os.environ.setdefault(_var, _threads)
@@ -0,0 +1,205 @@
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional; kernels then run as plain Python
+    prange = range
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True, nogil=True)
+def run_engine(prices, sigs, cash0, slip):
+    """
+    Event loop of the backtester over dense [T, N] arrays.
+
+    Args:
+        prices: float32/float64 array of close prices (NaN where there is no quote)
+        sigs: int8 array of signals (+1 buy, -1 sell, 0 nothing)
+        cash0: starting cash
+        slip: slippage applied on both entries and exits
+
+    Returns:
+        float64 array of length T with the marked-to-market equity
+    """
+    T, N = prices.shape
+    equity = np.empty(T)
+    qty = np.zeros(N)
+    last = np.zeros(N)  # last quoted price of each open position
+    cash = cash0
+
+    for t in range(T):
+        for i in range(N):
+            s = sigs[t, i]
+            if s == 0:
+                continue
+            p = prices[t, i]
+            if p != p:
+                continue
+
+            if s == 1 and qty[i] == 0:
+                q = cash / (10 * p)  # allocate 10% of cash
+                cash -= q * p * (1 + slip)
+                qty[i] = q
+                last[i] = p
+            elif s == -1 and qty[i] != 0:
+                cash += qty[i] * p * (1 - slip)
+                qty[i] = 0.0
+
+        # Mark open positions to market; an unquoted bar carries the last quote
+        # forward (the entry fill is the first one), so gaps don't move equity
+        mtm = cash
+        for i in range(N):
+            if qty[i] != 0:
+                p = prices[t, i]
+                if p == p:
+                    last[i] = p
+                mtm += qty[i] * last[i]
+        equity[t] = mtm
+
+    return equity
+
+
+@njit(cache=True)
+def last_valid_row(a, how_any):
+    """
+    Position of the last row of a [T, N] array that dropna would keep, scanning
+    backwards: with how_any, a row must have no NaN at all; otherwise it needs
+    at least one non-NaN value. Returns -1 when no row qualifies.
+    """
+    T, N = a.shape
+    for t in range(T - 1, -1, -1):
+        nans = 0
+        for i in range(N):
+            if a[t, i] != a[t, i]:
+                nans += 1
+        if (nans == 0) if how_any else (nans < N):
+            return t
+    return -1
+
+
+@njit(parallel=True, cache=True)
+def rolling_mean(a, window, min_periods):
+    """
+    Column-wise rolling mean of a [T, N] array with a sliding-sum kernel.
+
+    Mirrors pandas rolling(window, min_periods).mean(): NaNs are skipped, a
+    window with fewer than min_periods valid values yields NaN, the running sum
+    is Kahan-compensated and a window of identical values returns that value
+    exactly, so close == SMA ties compare the same way as in pandas.
+    """
+    T, N = a.shape
+    out = np.empty((T, N))
+
+    for j in prange(N):
+        total = 0.0
+        comp_add = 0.0
+        comp_remove = 0.0
+        count = 0
+        neg = 0
+        same = 0
+        prev = np.nan
+        for t in range(T):
+            if t >= window:
+                old = a[t - window, j]
+                if old == old:
+                    count -= 1
+                    y = -old - comp_remove
+                    s = total + y
+                    comp_remove = s - total - y
+                    total = s
+                    if old < 0:
+                        neg -= 1
+
+            v = a[t, j]
+            if v == v:
+                count += 1
+                y = v - comp_add
+                s = total + y
+                comp_add = s - total - y
+                total = s
+                if v < 0:
+                    neg += 1
+                if v == prev:
+                    same += 1
+                else:
+                    same = 1
+                prev = v
+
+            if count >= min_periods and count > 0:
+                m = total / count
+                if same >= count:
+                    m = prev
+                elif neg == 0 and m < 0:
+                    m = 0.0
+                elif neg == count and m > 0:
+                    m = 0.0
+                out[t, j] = m
+            else:
+                out[t, j] = np.nan
+
+    return out
+
+
+@njit(parallel=True, cache=True)
+def count_returns(r):
+    """
+    Count valid, advancing, declining and unchanged entries per row of a
+    [T, N] returns array in a single pass (NaNs are not counted).
+    """
+    T, N = r.shape
+    valid = np.empty(T, np.int64)
+    adv = np.empty(T, np.int64)
+    dec = np.empty(T, np.int64)
+    unchanged = np.empty(T, np.int64)
+
+    for t in prange(T):
+        v = 0
+        a = 0
+        d = 0
+        u = 0
+        for i in range(N):
+            x = r[t, i]
+            if x == x:
+                v += 1
+                if x > 0:
+                    a += 1
+                elif x < 0:
+                    d += 1
+                else:
+                    u += 1
+        valid[t] = v
+        adv[t] = a
+        dec[t] = d
+        unchanged[t] = u
+
+    return valid, adv, dec, unchanged
+
+
+@njit(parallel=True, cache=True)
+def count_above(c, m):
+    """
+    Count, per row, entries where both c and m are valid and where c is
+    strictly above m, in a single pass over both arrays.
+    """
+    T, N = c.shape
+    above = np.empty(T, np.int64)
+    valid = np.empty(T, np.int64)
+
+    for t in prange(T):
+        ab = 0
+        v = 0
+        for i in range(N):
+            ci = c[t, i]
+            mi = m[t, i]
+            if ci == ci and mi == mi:
+                v += 1
+                if ci > mi:
+                    ab += 1
+        above[t] = ab
+        valid[t] = v
+
+    return above, valid
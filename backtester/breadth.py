@@ -1,6 +1,13 @@
 import pandas as pd
 import numpy as np
 from typing import Optional, Union, List
+from backtester._engine import rolling_mean, count_returns, count_above, last_valid_row
+
+def _safe_ratio(num: np.ndarray, denom: np.ndarray) -> np.ndarray:
+    """Divide num by denom element-wise, yielding NaN where denom is not positive."""
+    out = np.full(len(denom), np.nan)
+    np.divide(num, denom, out=out, where=denom > 0)
+    return out
 
 class BreadthCalculator:
     def __init__(self, data_handler):
@@ -11,6 +18,7 @@ class BreadthCalculator:
             data_handler: DataHandler instance containing stock data
         """
         self.dh = data_handler
+        self._close_cache = {}
         
         # Validate that we have data
         if not self.dh.data:
@@ -19,6 +27,7 @@ class BreadthCalculator:
     def _get_close_data(self, use_common_dates: bool = True) -> pd.DataFrame:
         """
         Extract close prices for all tickers aligned by dates.
+        The result is cached per use_common_dates, so callers must not modify it.
         
         Args:
             use_common_dates: If True, use only dates common to all stocks.
@@ -27,6 +36,9 @@ class BreadthCalculator:
         Returns:
             DataFrame with dates as index and tickers as columns
         """
+        if use_common_dates in self._close_cache:
+            return self._close_cache[use_common_dates]
+        
         if use_common_dates:
             target_dates = self.dh.dates
             if target_dates.empty:
@@ -35,80 +47,54 @@ class BreadthCalculator:
         else:
             target_dates = self.dh.get_union_index()
         
-        close_data = {}
-        missing_close = []
-        
-        for ticker, df in self.dh.data.items():
-            if "close" not in df.columns:
-                missing_close.append(ticker)
-                continue
-            
-            # Align data to target dates
-            aligned_close = df["close"].reindex(target_dates)
-            close_data[ticker] = aligned_close
+        missing_close = [ticker for ticker, df in self.dh.data.items() if "close" not in df.columns]
         
         if missing_close:
             print(f"Warning: 'close' column missing for tickers: {missing_close}")
         
-        if not close_data:
+        if len(missing_close) == len(self.dh.data):
             raise ValueError("No valid close price data found")
         
-        return pd.DataFrame(close_data, index=target_dates)
+        # Wrap the handler's dense close matrix; it is already aligned to the union of dates
+        close = pd.DataFrame(self.dh.matrix("close"), index=self.dh.index, columns=self.dh.tickers)
+        if missing_close:
+            close = close.drop(columns=missing_close)
+        close = close.reindex(target_dates)
+        
+        self._close_cache[use_common_dates] = close
+        return close
     
-    def compute(self, 
-                sma_period: int = 50, 
-                use_common_dates: bool = True,
-                min_stocks_for_calculation: int = 1) -> pd.DataFrame:
+    def _compute_core(self,
+                      close: pd.DataFrame,
+                      sma_periods: List[int],
+                      min_stocks_for_calculation: int = 1) -> pd.DataFrame:
         """
-        Compute market breadth indicators.
+        Compute breadth indicators for one or more SMA periods in a single pass.
+        
+        Returns and their counts are computed once in a single fused pass; each SMA
+        period then takes one pass over close and its SMA. The minimum stock filter
+        and the valid_for_sma column apply to the first period only.
         
         Args:
-            sma_period: Period for simple moving average calculation
-            use_common_dates: Whether to use only common dates across all stocks
+            close: Aligned close prices with dates as index and tickers as columns
+            sma_periods: List of SMA periods, the first one being the primary period
             min_stocks_for_calculation: Minimum number of stocks needed for valid calculation
         
         Returns:
             DataFrame with breadth indicators
         """
-        if sma_period < 1:
-            raise ValueError("sma_period must be positive")
-        
-        # Get aligned close prices
-        close = self._get_close_data(use_common_dates)
-        
-        if close.empty:
-            return pd.DataFrame()
-        
         # Calculate returns
-        returns = close.pct_change()
+        r = close.pct_change().to_numpy()
         
-        # Count valid returns per day (exclude NaN)
-        valid_returns = returns.notna().sum(axis=1)
+        # Count valid returns, advancers, decliners and unchanged in one pass (excluding NaN)
+        valid_returns, adv, dec, unchanged = count_returns(r)
         
         # Filter days with insufficient data
         sufficient_data_mask = valid_returns >= min_stocks_for_calculation
         
-        # Calculate advancers and decliners (excluding NaN)
-        adv = (returns > 0).sum(axis=1)
-        dec = (returns < 0).sum(axis=1)
-        unchanged = (returns == 0).sum(axis=1)
-        
         # Calculate advance ratio (handle division by zero)
         total_movers = adv + dec
-        adv_ratio = np.where(total_movers > 0, adv / total_movers, np.nan)
-        
-        # Calculate SMA and percentage above SMA
-        sma = close.rolling(window=sma_period, min_periods=max(1, sma_period//2)).mean()
-        
-        # Count stocks above SMA (excluding NaN comparisons)
-        above_sma = (close > sma).sum(axis=1)
-        valid_sma_comparisons = ((close.notna()) & (sma.notna())).sum(axis=1)
-        
-        pct_above_sma = np.where(
-            valid_sma_comparisons > 0, 
-            above_sma / valid_sma_comparisons, 
-            np.nan
-        )
+        adv_ratio = _safe_ratio(adv, total_movers)
         
         # Create result DataFrame
         result = pd.DataFrame({
@@ -116,16 +102,56 @@ class BreadthCalculator:
             "decliners": dec,
             "unchanged": unchanged,
             "total_stocks": valid_returns,
-            "adv_ratio": adv_ratio,
-            f"pct_above_sma_{sma_period}": pct_above_sma,
-            "valid_for_sma": valid_sma_comparisons
+            "adv_ratio": adv_ratio
         }, index=close.index)
         
-        # Apply minimum stock filter
-        result.loc[~sufficient_data_mask, :] = np.nan
+        c = close.to_numpy()
+        
+        for i, period in enumerate(sma_periods):
+            # Calculate SMA and percentage above SMA
+            sma = rolling_mean(c, period, max(1, period//2))
+            
+            # Count stocks above SMA (excluding NaN comparisons)
+            above_sma, valid_sma_comparisons = count_above(c, sma)
+            
+            pct_above_sma = _safe_ratio(above_sma, valid_sma_comparisons)
+            
+            result[f"pct_above_sma_{period}"] = pct_above_sma
+            
+            if i == 0:
+                result["valid_for_sma"] = valid_sma_comparisons
+                
+                # Apply minimum stock filter
+                result.loc[~sufficient_data_mask, :] = np.nan
         
         return result
     
+    def compute(self, 
+                sma_period: int = 50, 
+                use_common_dates: bool = True,
+                min_stocks_for_calculation: int = 1) -> pd.DataFrame:
+        """
+        Compute market breadth indicators.
+        
+        Args:
+            sma_period: Period for simple moving average calculation
+            use_common_dates: Whether to use only common dates across all stocks
+            min_stocks_for_calculation: Minimum number of stocks needed for valid calculation
+        
+        Returns:
+            DataFrame with breadth indicators
+        """
+        if sma_period < 1:
+            raise ValueError("sma_period must be positive")
+        
+        # Get aligned close prices
+        close = self._get_close_data(use_common_dates)
+        
+        if close.empty:
+            return pd.DataFrame()
+        
+        return self._compute_core(close, [sma_period], min_stocks_for_calculation)
+    
     def compute_multiple_sma(self, 
                            sma_periods: List[int] = [20, 50, 200],
                            use_common_dates: bool = True) -> pd.DataFrame:
@@ -142,32 +168,19 @@ class BreadthCalculator:
         if not sma_periods:
             raise ValueError("sma_periods cannot be empty")
         
-        # Get base indicators with first SMA period
-        result = self.compute(sma_periods[0], use_common_dates)
-        
-        if len(sma_periods) == 1:
-            return result
+        if sma_periods[0] < 1:
+            raise ValueError("sma_period must be positive")
         
-        # Add additional SMA periods
+        # Get aligned close prices
         close = self._get_close_data(use_common_dates)
         
-        for period in sma_periods[1:]:
-            if period < 1:
-                continue
-                
-            sma = close.rolling(window=period, min_periods=max(1, period//2)).mean()
-            above_sma = (close > sma).sum(axis=1)
-            valid_comparisons = ((close.notna()) & (sma.notna())).sum(axis=1)
-            
-            pct_above_sma = np.where(
-                valid_comparisons > 0,
-                above_sma / valid_comparisons,
-                np.nan
-            )
-            
-            result[f"pct_above_sma_{period}"] = pct_above_sma
+        if close.empty:
+            return pd.DataFrame()
         
-        return result
+        # Additional SMA periods that are not positive are skipped
+        periods = [sma_periods[0]] + [p for p in sma_periods[1:] if p >= 1]
+        
+        return self._compute_core(close, periods)
     
     def get_breadth_summary(self, date: Optional[str] = None) -> dict:
         """
@@ -186,7 +199,8 @@ class BreadthCalculator:
         
         if date is None:
             # Get latest date with data
-            latest_idx = breadth.dropna().index[-1] if not breadth.dropna().empty else breadth.index[-1]
+            pos = last_valid_row(breadth.to_numpy(), True)
+            latest_idx = breadth.index[pos] if pos >= 0 else breadth.index[-1]
         else:
             try:
                 latest_idx = pd.to_datetime(date)
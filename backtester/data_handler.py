@@ -1,27 +1,47 @@
 import os
-import glob
+import functools
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import numpy as np
 import pandas as pd
 from typing import Dict, Optional, List
 
+def _scan_csv(folder: str) -> List[os.DirEntry]:
+    """CSV entries in folder, sorted by name, from a single directory read."""
+    with os.scandir(folder) as it:
+        entries = [
+            e for e in it
+            if e.name.lower().endswith(".csv") and not e.name.startswith(".") and e.is_file()
+        ]
+    return sorted(entries, key=lambda e: e.name)
+
 class DataHandler:
-    def __init__(self, folder: str):
+    def __init__(self, folder: str, n_workers: Optional[int] = None,
+                 use_processes: bool = False):
         """
         Initialize DataHandler with a folder containing CSV files.
         
         Args:
             folder: Path to folder containing CSV files with stock data
+            n_workers: Number of parallel workers reading the CSV files
+                       (None lets the executor pick its default)
+            use_processes: Parse files in worker processes instead of threads.
+                           On platforms that spawn processes (Windows), the calling
+                           script must guard its entry point with
+                           `if __name__ == "__main__":`.
         """
         if not os.path.exists(folder):
             raise FileNotFoundError(f"Folder '{folder}' does not exist")
         
         self.folder = folder
+        self.n_workers = n_workers
+        self.use_processes = use_processes
         self.data = self._load_data()
         self.tickers = sorted(self.data.keys())
-        self.dates = self._get_common_index()
+        self._matrices: Dict[str, np.ndarray] = {}
 
     def _load_data(self) -> Dict[str, pd.DataFrame]:
         """Load all CSV files from the folder."""
-        files = glob.glob(os.path.join(self.folder, "*.csv"))
+        files = [e.path for e in _scan_csv(self.folder)]
         
         if not files:
             raise ValueError(f"No CSV files found in folder '{self.folder}'")
@@ -29,19 +49,26 @@ class DataHandler:
         data = {}
         failed_files = []
         
-        for file_path in files:
+        # Read CSVs concurrently; results are consumed in file order below
+        executor_cls = ProcessPoolExecutor if self.use_processes else ThreadPoolExecutor
+        with executor_cls(max_workers=self.n_workers) as executor:
+            futures = [(file_path, executor.submit(self._read_file, file_path)) for file_path in files]
+        
+        for file_path, future in futures:
             try:
                 ticker = os.path.splitext(os.path.basename(file_path))[0]
                 
-                # Read CSV
-                df = pd.read_csv(file_path, parse_dates=["date"], index_col="date")
+                df = future.result()
                 
                 if df.empty:
                     print(f"Warning: Empty file {file_path}")
                     continue
                 
-                # Ensure datetime index and drop timezone if present
-                df.index = pd.to_datetime(df.index, errors="coerce")
+                # read_csv already parsed the dates; only fall back for unparsed indices
+                if not isinstance(df.index, pd.DatetimeIndex):
+                    df.index = pd.to_datetime(df.index, errors="coerce")
+                
+                # Drop timezone if present
                 if df.index.tz is not None:
                     df.index = df.index.tz_localize(None)
 
@@ -66,39 +93,75 @@ class DataHandler:
         
         return data
 
-    def _get_common_index(self) -> pd.DatetimeIndex:
+    @staticmethod
+    def _read_file(file_path: str) -> pd.DataFrame:
+        """Read a single ticker CSV with a date index."""
+        return pd.read_csv(file_path, parse_dates=["date"], index_col="date")
+
+    # Date indices and matrices are derived lazily and cached; self.data is
+    # not modified after __init__, so they never need invalidating.
+
+    @property
+    def dates(self) -> pd.DatetimeIndex:
+        """Dates common to all tickers."""
+        return self.common_index
+
+    @property
+    def index(self) -> pd.DatetimeIndex:
+        """Date index of the rows of self.matrix() (union of all dates)."""
+        return self.union_index
+
+    def matrix(self, column: str) -> np.ndarray:
+        """
+        Align one column of every ticker to the union of dates and stack it into
+        a single [date, ticker] float64 array (tickers in self.tickers order).
+        Built on first request and cached per column; tickers lacking the column
+        get NaN.
+        """
+        if column not in self._matrices:
+            index = self.union_index
+            missing = np.full(len(index), np.nan)
+            self._matrices[column] = np.column_stack([
+                self.data[ticker][column].reindex(index).to_numpy(dtype=np.float64)
+                if column in self.data[ticker].columns else missing
+                for ticker in self.tickers
+            ])
+        
+        return self._matrices[column]
+
+    def _index_arrays(self) -> List[np.ndarray]:
+        """Get the tz-naive date index of every ticker as a datetime64 array."""
+        arrays = []
+        for df in self.data.values():
+            idx = df.index
+            if idx.tz is not None:
+                idx = idx.tz_localize(None)
+            arrays.append(idx.to_numpy())
+        return arrays
+
+    @functools.cached_property
+    def common_index(self) -> pd.DatetimeIndex:
         """Get intersection of all date indices (truly common dates)."""
         if not self.data:
             return pd.DatetimeIndex([])
         
-        all_indices = list(self.data.values())
-        common_index = all_indices[0].index
+        # Dates are unique per ticker, so a date is common iff it occurs in every index
+        arrays = self._index_arrays()
+        uniq, counts = np.unique(np.concatenate(arrays), return_counts=True)
         
-        for df in all_indices[1:]:
-            idx = df.index
-            if idx.tz is not None:
-                idx = idx.tz_localize(None)
-            common_index = common_index.intersection(idx)
-        
-        return common_index.sort_values()
+        return pd.DatetimeIndex(uniq[counts == len(arrays)], name="date")
     
-    def get_union_index(self) -> pd.DatetimeIndex:
+    @functools.cached_property
+    def union_index(self) -> pd.DatetimeIndex:
         """Get union of all date indices (all dates from all files)."""
         if not self.data:
             return pd.DatetimeIndex([])
         
-        all_indices = []
-        for df in self.data.values():
-            idx = df.index
-            if idx.tz is not None:
-                idx = idx.tz_localize(None)
-            all_indices.append(idx)
-
-        union_index = all_indices[0]
-        for idx in all_indices[1:]:
-            union_index = union_index.union(idx)
-        
-        return union_index.sort_values()
+        return pd.DatetimeIndex(np.unique(np.concatenate(self._index_arrays())), name="date")
+    
+    def get_union_index(self) -> pd.DatetimeIndex:
+        """Get union of all date indices (all dates from all files)."""
+        return self.union_index
 
     def get_panel(self, use_union_dates: bool = False, 
                   columns: Optional[List[str]] = None) -> pd.DataFrame:
@@ -115,7 +178,7 @@ class DataHandler:
             print("Warning: No common dates found across all files")
             target_dates = self.get_union_index()
         
-        frames = []
+        frames = {}
         for ticker, df in self.data.items():
             # Select columns if specified
             if columns:
@@ -128,18 +191,15 @@ class DataHandler:
                 df_subset = df
             
             # Reindex to align dates
-            df_aligned = df_subset.reindex(target_dates)
-            df_aligned["ticker"] = ticker
-            frames.append(df_aligned)
+            frames[ticker] = df_subset.reindex(target_dates)
         
         if not frames:
             return pd.DataFrame()
         
-        # Concatenate and create MultiIndex
-        panel = pd.concat(frames, ignore_index=False)
-        panel.index.name = "date"
+        # Concatenate with the ticker as the outer key, then swap to (date, ticker)
+        panel = pd.concat(frames, names=["ticker", "date"])
         
-        return panel.reset_index().set_index(["date", "ticker"]).sort_index()
+        return panel.swaplevel(0, 1).sort_index()
     
     def get_ticker_data(self, ticker: str) -> pd.DataFrame:
         """Get data for a specific ticker."""
@@ -3,18 +3,35 @@ import numpy as np
 class KPIReport:
     def __init__(self, equity_curve):
         self.eq = equity_curve
+        # Each metric is computed independently from the raw equity array
+        self._metric_fns = {
+            "Total Return": self._total_return,
+            "Annualized Return": self._annualized_return,
+            "Sharpe": self._sharpe,
+            "Max Drawdown": self._max_drawdown,
+        }
+
+    def _total_return(self, e):
+        return e[-1] / e[0] - 1
+
+    def _annualized_return(self, e):
+        return (1 + self._total_return(e)) ** (252 / len(e)) - 1
+
+    def _sharpe(self, e):
+        ret = np.zeros_like(e)
+        ret[1:] = e[1:] / e[:-1] - 1
+        ret[np.isnan(ret)] = 0
+        vol = ret.std(ddof=1) * (252 ** 0.5)
+        return self._annualized_return(e) / vol if vol != 0 else np.nan
+
+    def _max_drawdown(self, e):
+        return np.nanmin(e / np.fmax.accumulate(e) - 1)
+
+    def iter_summary(self):
+        """Yield (name, value) pairs, computing each KPI only when it is requested."""
+        e = self.eq["equity"].to_numpy(dtype=np.float64)
+        for name, fn in self._metric_fns.items():
+            yield name, fn(e)
 
     def summary(self):
-        eq = self.eq.copy()
-        eq["ret"] = eq["equity"].pct_change().fillna(0)
-        total_ret = eq["equity"].iloc[-1] / eq["equity"].iloc[0] - 1
-        ann_ret = (1 + total_ret) ** (252 / len(eq)) - 1
-        vol = eq["ret"].std() * (252 ** 0.5)
-        sharpe = ann_ret / vol if vol != 0 else np.nan
-        dd = (eq["equity"] / eq["equity"].cummax() - 1).min()
-        return {
-            "Total Return": total_ret,
-            "Annualized Return": ann_ret,
-            "Sharpe": sharpe,
-            "Max Drawdown": dd
-        }
+        return dict(self.iter_summary())
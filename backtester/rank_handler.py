@@ -1,6 +1,64 @@
+import numpy as np
 import pandas as pd
+from backtester._engine import rolling_mean, last_valid_row
 
-class RankingHandler:
+class _TopNRanker:
+    """Top-N selection shared by the ranking handlers; works on any metric frame."""
+
+    def get_top_n(self, metric: pd.DataFrame, n: int = 10, date: str = None) -> pd.Series:
+        """
+        Return top N tickers for a given metric on a specific date
+        """
+        # Latest row where not all tickers are NaN
+        last_pos = last_valid_row(metric.to_numpy(), False)
+        if last_pos < 0:
+            print("Warning: Metric has no valid data to rank!")
+            return pd.Series(dtype=float)
+
+        # Determine date
+        if date is None:
+            date_idx = metric.index[last_pos]
+        else:
+            date_idx = pd.to_datetime(date)
+            if date_idx not in metric.index or metric.loc[date_idx].isna().all():
+                print(f"Warning: Date {date} not found. Using latest available date.")
+                date_idx = metric.index[last_pos]
+
+        # Get row and drop NaNs
+        row = metric.loc[date_idx].dropna()
+        if row.empty:
+            print(f"Warning: No valid tickers to rank on {date_idx}!")
+            return pd.Series(dtype=float)
+
+        # Return top N
+        return row.sort_values(ascending=False).head(n)
+
+    def get_top_n_all(self, metric: pd.DataFrame, n: int = 10) -> pd.DataFrame:
+        """
+        Return top N tickers for every date at once: one row per date, columns
+        1..n holding the tickers ranked best first (None where fewer than n are valid)
+        """
+        values = metric.to_numpy(dtype=np.float64)
+        k = min(n, values.shape[1])
+        if k <= 0:
+            return pd.DataFrame(index=metric.index)
+
+        # Partial selection per row (introselect, linear in the ticker count),
+        # then order only the k winners
+        filled = np.where(np.isnan(values), -np.inf, values)
+        idx = np.argpartition(-filled, k - 1, axis=1)[:, :k]
+        top = np.take_along_axis(filled, idx, axis=1)
+        order = np.argsort(-top, axis=1, kind="stable")
+        idx = np.take_along_axis(idx, order, axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+
+        labels = metric.columns.to_numpy(dtype=object)[idx]
+        labels[np.isneginf(top)] = None
+        # dtype=object keeps the None padding (pandas would infer a string dtype with NaN)
+        return pd.DataFrame(labels, index=metric.index, columns=range(1, k + 1), dtype=object)
+
+
+class RankingHandler(_TopNRanker):
 
     def __init__(self, panel: pd.DataFrame):
         if not isinstance(panel, pd.DataFrame):
@@ -8,22 +66,47 @@ class RankingHandler:
         if not isinstance(panel.index, pd.MultiIndex):
             raise ValueError("panel must have a MultiIndex [date, ticker]")
 
-        self.panel = panel.copy()
+        # Keep a reference only; the unstacked close/volume matrices are built lazily
+        self.panel = panel
+        self._close = None
+        self._log_close = None
+        self._volume = None
+
+    def _close_matrix(self) -> pd.DataFrame:
+        if self._close is None:
+            self._close = self.panel['close'].unstack(level=1)
+        return self._close
+
+    def _log_close_matrix(self) -> pd.DataFrame:
+        # Shared by momentum and relative_strength: price ratios become differences.
+        # Kept in float64 even for float32 panels, since cumulative RS compounds it.
+        if self._log_close is None:
+            with np.errstate(divide="ignore"):
+                self._log_close = np.log(self._close_matrix().astype(np.float64))
+        return self._log_close
+
+    def _volume_matrix(self) -> pd.DataFrame:
+        if self._volume is None:
+            self._volume = self.panel['volume'].unstack(level=1)
+        return self._volume
 
     # ------------------------------
     # Momentum
     # ------------------------------
     def momentum(self, period: int = 5) -> pd.DataFrame:
-        close = self.panel['close'].unstack(level=1)
-        # Safely compute pct_change
-        return close.pct_change(period).fillna(0)
+        log_close = self._log_close_matrix()
+        # pct_change(period) computed as a log difference; safely fill NaNs
+        with np.errstate(invalid="ignore"):
+            return np.expm1(log_close - log_close.shift(period)).fillna(0)
 
     # ------------------------------
     # Rolling Volume Rank
     # ------------------------------
     def volume_rank(self, period: int = 5) -> pd.DataFrame:
-        volume = self.panel['volume'].unstack(level=1)
-        return volume.rolling(period, min_periods=1).mean().fillna(0)
+        volume = self._volume_matrix()
+        # Numba sliding-sum kernel, identical to volume.rolling(period, min_periods=1).mean()
+        avg = rolling_mean(volume.to_numpy(dtype=np.float64), period, 1)
+        return pd.DataFrame(avg, index=volume.index, columns=volume.columns).fillna(0)
 
     # ------------------------------
     # Custom metric
@@ -35,24 +118,27 @@ class RankingHandler:
     # Relative Strength vs benchmark
     # ------------------------------
     def relative_strength(self, benchmark: str = "NIFTY50", method: str = "cumulative") -> pd.DataFrame:
-        close = self.panel['close'].unstack(level=1)
+        log_close = self._log_close_matrix()
 
-        if benchmark not in close.columns:
+        if benchmark not in log_close.columns:
             raise ValueError(f"Benchmark '{benchmark}' not found in panel")
 
         # Only keep dates where benchmark exists
-        close = close.loc[close[benchmark].notna()]
+        log_close = log_close.loc[log_close[benchmark].notna()]
 
-        # Compute daily returns
-        returns = close.pct_change().fillna(0)
+        # Compute daily log returns
+        with np.errstate(invalid="ignore"):
+            log_returns = log_close.diff().fillna(0)
 
         if method == "daily":
             # Daily relative strength = ticker return - benchmark return
+            returns = np.expm1(log_returns)
             rs = returns.subtract(returns[benchmark], axis=0)
         elif method == "cumulative":
-            # Cumulative relative strength = cumulative returns vs benchmark
-            cum_returns = (1 + returns).cumprod()
-            rs = cum_returns.div(cum_returns[benchmark], axis=0)
+            # Cumulative relative strength = cumulative returns vs benchmark,
+            # accumulated in log space: one cumsum instead of a cumprod plus a divide
+            log_rel = log_returns.subtract(log_returns[benchmark], axis=0)
+            rs = np.exp(log_rel.cumsum())
         else:
             raise ValueError("method must be 'daily' or 'cumulative'")
 
@@ -60,33 +146,94 @@ class RankingHandler:
         rs = rs.drop(columns=[benchmark])
         return rs
 
+
+class MatrixRankingHandler(_TopNRanker):
+    """
+    RankingHandler over dense [date, ticker] close and volume matrices.
+    Every metric is a column-wise array op on contiguous float32 data; results
+    come back as DataFrames so they plug into get_top_n / get_top_n_all.
+    """
+
+    def __init__(self, close: np.ndarray, volume: np.ndarray, tickers, dates):
+        self.close = np.ascontiguousarray(close, dtype=np.float32)
+        self.volume = np.ascontiguousarray(volume, dtype=np.float32)
+        self.tickers = pd.Index(tickers, name="ticker")
+        self.dates = pd.DatetimeIndex(dates, name="date")
+
+        if self.close.shape != (len(self.dates), len(self.tickers)):
+            raise ValueError("close must have shape (len(dates), len(tickers))")
+        if self.volume.shape != self.close.shape:
+            raise ValueError("volume must have the same shape as close")
+
+    @classmethod
+    def from_panel(cls, panel: pd.DataFrame) -> "MatrixRankingHandler":
+        """Pivot a [date, ticker] panel once into the close/volume matrices"""
+        close = panel['close'].unstack(level=1)
+        volume = panel['volume'].unstack(level=1).reindex(columns=close.columns)
+        return cls(close.to_numpy(np.float32), volume.to_numpy(np.float32), close.columns, close.index)
+
+    def _frame(self, values: np.ndarray, dates=None, tickers=None) -> pd.DataFrame:
+        return pd.DataFrame(
+            values,
+            index=self.dates if dates is None else dates,
+            columns=self.tickers if tickers is None else tickers,
+        )
+
     # ------------------------------
-    # Get top N tickers
+    # Momentum
     # ------------------------------
-    def get_top_n(self, metric: pd.DataFrame, n: int = 10, date: str = None) -> pd.Series:
-        """
-        Return top N tickers for a given metric on a specific date
-        """
-        # Drop rows where all tickers are NaN
-        metric_clean = metric.dropna(how='all')
-        if metric_clean.empty:
-            print("Warning: Metric has no valid data to rank!")
-            return pd.Series(dtype=float)
+    def momentum(self, period: int = 5) -> pd.DataFrame:
+        c = self.close
+        out = np.zeros_like(c)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            if 0 < period < len(c):
+                out[period:] = c[period:] / c[:-period] - 1
+            elif 0 < -period < len(c):
+                # Negative periods look forward, like pct_change(period)
+                out[:period] = c[:period] / c[-period:] - 1
+        # Same as pct_change(period).fillna(0) on the unstacked close
+        out[np.isnan(out)] = 0
+        return self._frame(out)
 
-        # Determine date
-        if date is None:
-            date_idx = metric_clean.index[-1]
-        else:
-            date_idx = pd.to_datetime(date)
-            if date_idx not in metric_clean.index:
-                print(f"Warning: Date {date} not found. Using latest available date.")
-                date_idx = metric_clean.index[-1]
+    # ------------------------------
+    # Rolling Volume Rank
+    # ------------------------------
+    def volume_rank(self, period: int = 5) -> pd.DataFrame:
+        avg = rolling_mean(self.volume.astype(np.float64), period, 1)
+        avg[np.isnan(avg)] = 0
+        return self._frame(avg)
 
-        # Get row and drop NaNs
-        row = metric_clean.loc[date_idx].dropna()
-        if row.empty:
-            print(f"Warning: No valid tickers to rank on {date_idx}!")
-            return pd.Series(dtype=float)
+    # ------------------------------
+    # Custom metric
+    # ------------------------------
+    def custom_metric(self, func) -> pd.DataFrame:
+        """func(close, volume) -> [date, ticker] array, returned as a DataFrame"""
+        return self._frame(func(self.close, self.volume))
 
-        # Return top N
-        return row.sort_values(ascending=False).head(n)
+    # ------------------------------
+    # Relative Strength vs benchmark
+    # ------------------------------
+    def relative_strength(self, benchmark: str = "NIFTY50", method: str = "cumulative") -> pd.DataFrame:
+        if benchmark not in self.tickers:
+            raise ValueError(f"Benchmark '{benchmark}' not found in panel")
+        if method not in ("daily", "cumulative"):
+            raise ValueError("method must be 'daily' or 'cumulative'")
+        b = self.tickers.get_loc(benchmark)
+
+        # Only keep dates where benchmark exists; log returns stay float64
+        # because the cumulative ratio compounds them
+        rows = ~np.isnan(self.close[:, b])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            log_close = np.log(self.close[rows].astype(np.float64))
+            log_returns = np.zeros_like(log_close)
+            log_returns[1:] = np.diff(log_close, axis=0)
+        log_returns[np.isnan(log_returns)] = 0
+
+        if method == "daily":
+            returns = np.expm1(log_returns)
+            rs = returns - returns[:, b:b + 1]
+        else:
+            rs = np.exp(np.cumsum(log_returns - log_returns[:, b:b + 1], axis=0))
+
+        # Drop benchmark column itself
+        return self._frame(np.delete(rs, b, axis=1), self.dates[rows], self.tickers.delete(b))
@@ -1,3 +1,4 @@
+import _threads  # noqa: F401  (pins thread pools; must precede numpy)
 import sys
 import pandas as pd
 
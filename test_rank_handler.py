@@ -1,13 +1,18 @@
+import _threads  # noqa: F401  (pins thread pools; must precede numpy)
 import sys
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+from pyarrow import csv as pacsv
+import pyarrow.compute as pc
 
 # -------------------------------
 # Add backtester folder to sys.path
 # -------------------------------
 sys.path.append(r"D:\Algo_trading\backtester")
 
-from data_handler import DataHandler
-from rank_handler import RankingHandler
+from rank_handler import MatrixRankingHandler
+from _shared import cached_panel
 
 # -------------------------------
 # CONFIG
@@ -21,47 +26,52 @@ volume_period = 5
 # -------------------------------
 # LOAD STOCK DATA
 # -------------------------------
-handler = DataHandler(stock_folder)
-panel = handler.get_panel(use_union_dates=True)
-
-# Make all dates tz-naive
-panel = panel.copy()
-panel.index = panel.index.set_levels(
-    [panel.index.levels[0].tz_localize(None), panel.index.levels[1]]
-)
+# Dates are already tz-naive: DataHandler drops the timezone when loading each CSV
+panel = cached_panel(stock_folder, use_union_dates=True)
 
 # -------------------------------
 # LOAD NIFTY50 DATA
 # -------------------------------
-nifty = pd.read_csv(nifty_file, parse_dates=["date"], index_col="date")
+# Arrow's multi-threaded CSV reader, converted to pandas in bulk.
+# Dates are made tz-naive at the Arrow boundary: any UTC offset is stripped so
+# the local wall-clock date is kept, then the column is cast to a naive timestamp
+table = pacsv.read_csv(
+    nifty_file,
+    convert_options=pacsv.ConvertOptions(column_types={"date": pa.string()}),
+)
+dates = pc.replace_substring_regex(table["date"], r"(Z|[+-]\d{2}:?\d{2})$", "").cast(pa.timestamp("ns"))
+nifty = table.set_column(table.schema.get_field_index("date"), "date", dates).to_pandas().set_index("date")
 
-# Ensure tz-naive
-nifty.index = nifty.index.tz_localize(None)
+# Drop duplicate dates and sort on the flat DatetimeIndex, before building the MultiIndex
+nifty = nifty[~nifty.index.duplicated(keep="last")].sort_index()
 
 # If volume column missing, create dummy
 if "volume" not in nifty.columns:
     nifty["volume"] = 0
 
-# Convert to MultiIndex format
-nifty_panel = nifty.copy()
-nifty_panel["ticker"] = "NIFTY50"
-nifty_panel = nifty_panel[["close", "volume", "ticker"]]
-nifty_panel = nifty_panel.reset_index().set_index(["date", "ticker"])
-
-# Drop duplicates in nifty_panel
-nifty_panel = nifty_panel[~nifty_panel.index.duplicated(keep="last")]
+# Convert to MultiIndex format; dates are already sorted, so the index is built as-is
+nifty_panel = nifty[["close", "volume"]].set_axis(
+    pd.MultiIndex.from_arrays(
+        [nifty.index, np.full(len(nifty), "NIFTY50", dtype=object)], names=["date", "ticker"]
+    )
+)
 
-# If NIFTY50 already exists in panel, drop it
-if "NIFTY50" in panel.index.get_level_values("ticker"):
+# If NIFTY50 already exists in panel, drop it (hash lookup on the unique ticker level)
+if "NIFTY50" in panel.index.levels[1]:
     panel = panel.drop("NIFTY50", level="ticker")
 
-# Merge clean
-panel = pd.concat([panel, nifty_panel]).sort_index()
+# Merge clean: both frames are sorted, so splice the NIFTY50 rows in at their
+# insertion points instead of re-sorting the whole combined MultiIndex
+pos = panel.index.searchsorted(nifty_panel.index)
+order = np.insert(np.arange(len(panel)), pos, np.arange(len(panel), len(panel) + len(nifty_panel)))
+panel = pd.concat([panel, nifty_panel]).iloc[order]
 
 # -------------------------------
 # INITIALIZE RANKING HANDLER
 # -------------------------------
-ranker = RankingHandler(panel)
+# Pivot once to dense [date, ticker] float32 close/volume matrices; every
+# metric below is then a column-wise array op instead of a MultiIndex op
+ranker = MatrixRankingHandler.from_panel(panel)
 
 # -------------------------------
 # 1. Momentum
@@ -97,3 +107,10 @@ print(top_mom)
 top_rs = ranker.get_top_n(rs, n=top_n)
 print(f"\nTop {top_n} tickers by relative strength vs NIFTY50:")
 print(top_rs)
+
+# -------------------------------
+# 6. Top N tickers by momentum for every date
+# -------------------------------
+top_mom_all = ranker.get_top_n_all(momentum, n=top_n)
+print(f"\nTop {top_n} tickers by {momentum_period}-day momentum, last 5 dates:")
+print(top_mom_all.tail())
@@ -1,17 +1,13 @@
-from backtester.data_handler import DataHandler
-from backtester.breadth import BreadthCalculator
+import _threads  # noqa: F401  (pins thread pools; must precede numpy)
 from Strategies.sma_crossover import SMACrossover
+from _shared import load_context, set_display_options
 
-# Step 1: Load all stock CSVs
-folder = r"D:\Algo_trading\Data\Day"
-dh = DataHandler(folder)
-
-# Step 2: Get panel (MultiIndex DataFrame)
-panel = dh.get_panel()
+set_display_options()
 
-# Step 3: Compute breadth indicators
-bc = BreadthCalculator(dh)
-breadth = bc.compute()
+# Steps 1-3: Load all stock CSVs, get panel (MultiIndex DataFrame) and
+# compute breadth indicators (shared with test_strategyandKPI.py)
+folder = r"D:\Algo_trading\Data\Day"
+panel, breadth = load_context(folder)
 
 # Step 4: Initialize strategy
 strat = SMACrossover(short=20, long=50)
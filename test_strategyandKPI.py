@@ -1,40 +1,60 @@
-from backtester.data_handler import DataHandler
-from backtester.breadth import BreadthCalculator
+import _threads  # noqa: F401  (pins thread pools; must precede numpy)
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
 from backtester.backtester import Backtester
 from backtester.kpi_report import KPIReport
 from Strategies.sma_crossover import SMACrossover
+from _shared import load_context, set_display_options
 
-# Step 1: Load all stock CSVs
-folder = r"D:\Algo_trading\Data\Day"
-dh = DataHandler(folder)
+set_display_options()
 
-# Step 2: Get panel (MultiIndex DataFrame)
-panel = dh.get_panel()
+def _eval(panel, breadth, short, long):
+    """Run one SMA crossover parameter pair end to end and return its KPIs."""
+    strat = SMACrossover(short=short, long=long)
+    signals = strat.generate_signals(panel, breadth)
+    equity_curve = Backtester(panel).run(signals)
+    return {"short": short, "long": long, **KPIReport(equity_curve).summary()}
 
-# Step 3: Compute breadth
-bc = BreadthCalculator(dh)
-breadth = bc.compute()
+# Steps 1-3: Load all stock CSVs, get panel (MultiIndex DataFrame) and
+# compute breadth (shared with test_strategy.py, which only inspects signals)
+folder = r"D:\Algo_trading\Data\Day"
+panel, breadth = load_context(folder)
 
 # Step 4: Initialize original SMA strategy
 strat = SMACrossover(short=20, long=50)  # original periods
 signals = strat.generate_signals(panel, breadth)
 
-# Step 5: Inspect signals
-print("Signals head:")
-print(signals.head(20))
-print("Number of trades:", (signals['signal'] != 0).sum())
-
-# Step 6: Run Backtester
+# Steps 5-6: Run Backtester while the signal diagnostics are formatted on a
+# second thread (the engine kernel releases the GIL)
 bt = Backtester(panel)
-equity_curve = bt.run(signals)
+with ThreadPoolExecutor(max_workers=2) as ex:
+    fut_equity = ex.submit(bt.run, signals)
+    fut_diag = ex.submit(
+        lambda: (signals.head(20).to_string(), int(np.count_nonzero(signals['signal'].to_numpy())))
+    )
+    signals_head, n_trades = fut_diag.result()
+    print("Signals head:")
+    print(signals_head)
+    print("Number of trades:", n_trades)
+    equity_curve = fut_equity.result()
 
 # Step 7: KPI
 report = KPIReport(equity_curve)
-summary = report.summary()
 
 # Step 8: Display
 print("Equity Curve head:")
 print(equity_curve.head(20))
 print("\nKPI Summary:")
-for k, v in summary.items():
+for k, v in report.iter_summary():
     print(f"{k}: {v}")
+
+# Step 9: Parameter sweep, one (short, long) pair per worker. The panel is
+# read-only, so its arrays are memory-mapped into the workers, not copied.
+grid = [(s, l) for s in (10, 20, 30) for l in (50, 100, 200) if s < l]
+results = Parallel(n_jobs=-1, backend="loky", mmap_mode="r")(
+    delayed(_eval)(panel, breadth, s, l) for s, l in grid
+)
+print("\nSMA parameter sweep:")
+print(pd.DataFrame(results).set_index(["short", "long"]))